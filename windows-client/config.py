@@ -37,6 +37,8 @@ SAFETY = {
     "failsafe_enabled": True,                   # Enable pyautogui failsafe
     "pause_between_actions": 0.1,              # Small pause between GUI actions
     "max_drugs_per_session": 50,               # Safety limit for drug count
+    "max_drug_name_length": 100,               # Reject longer drug names (likely OCR noise)
+    "recent_sessions_tracked": 5,              # Uncompleted sessions remembered to skip re-entered drugs (0 = off)
     "confirmation_required": False,             # Require confirmation before each step
 }
 
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Offline checks for drug list validation in the Windows automation client
+Runs without an Android device or GUI interaction
+"""
+
+import builtins
+import sys
+import types
+
+import windows_automation_client
+from windows_automation_client import (
+    WindowsAutomationClient,
+    REJECT_ALREADY_ENTERED,
+    REJECT_DUPLICATE,
+    REJECT_EMPTY,
+    REJECT_NOT_TEXT,
+    REJECT_OVER_LIMIT,
+    REJECT_TOO_LONG,
+)
+
+failures = 0
+
+def check(description: str, actual, expected):
+    """Compare a result against the expected value and report it"""
+    global failures
+    if actual == expected:
+        print(f"✅ {description}")
+    else:
+        failures += 1
+        print(f"❌ {description}")
+        print(f"   expected: {expected!r}")
+        print(f"   actual:   {actual!r}")
+
+def make_client(max_drugs: int = 50, max_length: int = 100, sessions: int = 2) -> WindowsAutomationClient:
+    """Create a client with explicit validation limits"""
+    client = WindowsAutomationClient("127.0.0.1")
+    client.max_drugs_per_session = max_drugs
+    client.max_drug_name_length = max_length
+    client.recent_sessions_tracked = sessions
+    client.confirmation_required = False
+    return client
+
+class FakeGUI:
+    """Records typed drugs instead of driving the keyboard"""
+    
+    def __init__(self, fail_on: int = 0):
+        self.typed = []
+        self.fail_on = fail_on
+        self.prompts = []
+        self.answer = "n"
+    
+    def typewrite(self, text: str):
+        if self.fail_on and len(self.typed) + 1 == self.fail_on:
+            raise windows_automation_client.pyautogui.FailSafeException()
+        self.typed.append(text)
+    
+    def press(self, key: str):
+        pass
+    
+    def input(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return self.answer
+
+def fake_gui(fail_on: int = 0) -> FakeGUI:
+    """Route GUI typing, delays and prompts through a FakeGUI"""
+    gui = FakeGUI(fail_on)
+    windows_automation_client.pyautogui.typewrite = gui.typewrite
+    windows_automation_client.pyautogui.press = gui.press
+    windows_automation_client.time = types.SimpleNamespace(sleep=lambda seconds: None)
+    builtins.input = gui.input
+    return gui
+
+def test_normalization():
+    print("\n1️⃣  Whitespace and case normalization...")
+    client = make_client()
+    accepted, rejected = client.validate_drugs(["  Parol   500mg ", "PAROL 500MG", "Aspirin\t100mg"])
+    check("whitespace is collapsed", accepted, ["Parol 500mg", "Aspirin 100mg"])
+    check("case-insensitive duplicate is rejected", rejected, [("PAROL 500MG", REJECT_DUPLICATE)])
+
+def test_empty_and_non_text():
+    print("\n2️⃣  Empty and non-text entries...")
+    client = make_client()
+    accepted, rejected = client.validate_drugs(["", "   ", None, 42, "Aspirin"])
+    check("only the real drug is accepted", accepted, ["Aspirin"])
+    check("empty and non-text entries are reported", rejected,
+          [("''", REJECT_EMPTY), ("'   '", REJECT_EMPTY), ("None", REJECT_NOT_TEXT), ("42", REJECT_NOT_TEXT)])
+
+def test_length_limit():
+    print("\n3️⃣  Drug name length limit...")
+    client = make_client(max_length=10)
+    accepted, rejected = client.validate_drugs(["Aspirin", "Augmentin BID 1000mg"])
+    check("short name is accepted", accepted, ["Aspirin"])
+    check("long name is rejected", rejected, [("Augmentin BID 1000mg", REJECT_TOO_LONG)])
+    
+    accepted, _ = client.validate_drugs(["Aspirin", "Augmentin BID 1000mg"], override=True)
+    check("override keeps the long name", accepted, ["Aspirin", "Augmentin BID 1000mg"])
+
+def test_session_limit():
+    print("\n4️⃣  Drugs per session limit...")
+    client = make_client(max_drugs=2)
+    accepted, rejected = client.validate_drugs(["A", "B", "b"])
+    check("list at the limit (after dedup) is accepted", accepted, ["A", "B"])
+
+    accepted, rejected = client.validate_drugs(["A", "B", "C"])
+    check("list over the limit is rejected entirely", accepted, [])
+    check("every drug is reported", rejected, [(name, REJECT_OVER_LIMIT) for name in ["A", "B", "C"]])
+
+def test_session_index():
+    print("\n5️⃣  Session-keyed duplicate index...")
+    client = make_client(sessions=2)
+    client._remember_session("s1", ["Parol 500mg", "Aspirin"])
+
+    accepted, _ = client.validate_drugs(["Parol 500mg", "Augmentin"], "s2")
+    check("other sessions keep overlapping drugs", accepted, ["Parol 500mg", "Augmentin"])
+
+    accepted, rejected = client.validate_drugs(["parol 500MG", "Augmentin"], "s1")
+    check("re-run of the same session skips entered drugs", accepted, ["Augmentin"])
+    check("skipped drug is reported", rejected, [("parol 500MG", REJECT_ALREADY_ENTERED)])
+
+    accepted, _ = client.validate_drugs(["Parol 500mg"])
+    check("no session ID means no cross-run skipping", accepted, ["Parol 500mg"])
+
+    client._remember_session("s1", ["Augmentin"])
+    check("same session accumulates entered drugs", client.entered_sessions["s1"],
+          {"parol 500mg", "aspirin", "augmentin"})
+
+    client._remember_session("s2", ["X"])
+    client._remember_session("s3", ["Y"])
+    check("oldest session is evicted at the bound", list(client.entered_sessions), ["s2", "s3"])
+
+    accepted, _ = client.validate_drugs(["Aspirin"], "s1")
+    check("evicted session no longer skips drugs", accepted, ["Aspirin"])
+
+    client = make_client(sessions=0)
+    client._remember_session("s1", ["Aspirin"])
+    check("tracking disabled with 0 sessions", client.entered_sessions, {})
+
+def test_paste_flow():
+    print("\n6️⃣  Drug entry flow (GUI simulated)...")
+    client = make_client(max_drugs=3, max_length=10)
+    
+    gui = fake_gui(fail_on=2)
+    check("failsafe stop returns False", client.paste_drugs_to_application(["A", "B", "C"], "s1"), False)
+    check("drugs typed before the stop are recorded", client.entered_sessions["s1"], {"a"})
+    
+    gui = fake_gui()
+    check("re-run after a stop succeeds", client.paste_drugs_to_application(["A", "B", "C"], "s1"), True)
+    check("re-run types only the remaining drugs", gui.typed, ["B", "C"])
+    check("already-entered skips do not prompt", gui.prompts, [])
+    
+    gui = fake_gui()
+    check("fully entered session returns True", client.paste_drugs_to_application(["A", "B", "C"], "s1"), True)
+    check("nothing is typed for a fully entered session", gui.typed, [])
+    
+    gui = fake_gui()
+    client.paste_drugs_to_application(["A", "a", "", "B"], "s2")
+    check("harmless rejections do not prompt", gui.prompts, [])
+    check("remaining drugs are typed", gui.typed, ["A", "B"])
+    
+    gui = fake_gui()
+    check("declined prompt returns False", client.paste_drugs_to_application(["A", "Augmentin 1000mg"], "s3"), False)
+    check("over-long name triggers a prompt", len(gui.prompts), 1)
+    check("nothing is typed after declining", gui.typed, [])
+    
+    gui = fake_gui()
+    gui.answer = "a"
+    check("enter-anyway returns True", client.paste_drugs_to_application(["A", "Augmentin 1000mg"], "s3"), True)
+    check("enter-anyway types the skipped drug", gui.typed, ["A", "Augmentin 1000mg"])
+    
+    gui = fake_gui()
+    gui.answer = "a"
+    client.confirmation_required = True
+    check("enter-anyway re-types an entered session", client.paste_drugs_to_application(["A", "B"], "s2"), True)
+    check("confirmation_required prompts for skips", len(gui.prompts), 1)
+    check("skipped drugs are re-typed", gui.typed, ["A", "B"])
+    client.confirmation_required = False
+    
+    gui = fake_gui()
+    check("over-limit list returns False", client.paste_drugs_to_application(["A", "B", "C", "D"], "s4"), False)
+    check("over-limit list never prompts or types", (gui.prompts, gui.typed), ([], []))
+
+def main():
+    print("🧪 Testing drug list validation")
+    print("=" * 50)
+
+    test_normalization()
+    test_empty_and_non_text()
+    test_length_limit()
+    test_session_limit()
+    test_session_index()
+    test_paste_flow()
+
+    print("\n" + "=" * 50)
+    if failures:
+        print(f"❌ {failures} validation checks failed")
+        sys.exit(1)
+    print("🎉 All validation checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,17 @@ import time
 import json
 import webbrowser
 import sys
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
+
+from config import SAFETY
+
+# Reasons a drug entry is rejected by WindowsAutomationClient.validate_drugs
+REJECT_NOT_TEXT = "not a text value"
+REJECT_EMPTY = "empty"
+REJECT_DUPLICATE = "duplicate in this list"
+REJECT_TOO_LONG = "name longer than max_drug_name_length"
+REJECT_ALREADY_ENTERED = "already entered for this session"
+REJECT_OVER_LIMIT = "list longer than max_drugs_per_session"
 
 class WindowsAutomationClient:
     def __init__(self, android_ip: str, android_port: int = 8080):
@@ -34,6 +44,14 @@ class WindowsAutomationClient:
         # Safety settings
         pyautogui.FAILSAFE = True      # Move mouse to corner to stop
         pyautogui.PAUSE = 0.1         # Small pause between actions
+        self.max_drugs_per_session = SAFETY["max_drugs_per_session"]
+        self.max_drug_name_length = SAFETY["max_drug_name_length"]
+        self.confirmation_required = SAFETY["confirmation_required"]
+        
+        # Bounded duplicate index: Android sessionId -> normalized drug keys
+        # already entered for that session, oldest session first
+        self.recent_sessions_tracked = SAFETY["recent_sessions_tracked"]
+        self.entered_sessions: Dict[str, Set[str]] = {}
         
         print(f"🤖 Windows Automation Client initialized")
         print(f"📱 Android server: {self.base_url}")
@@ -95,17 +113,149 @@ class WindowsAutomationClient:
             print(f"❌ Error fetching drugs: {e}")
             return None
     
-    def paste_drugs_to_application(self, drugs: List[str]) -> bool:
+    def get_prescription(self) -> Optional[Tuple[Optional[str], List[str]]]:
+        """
+        Get the active session ID together with its drugs from Android
+        
+        Returns:
+            Tuple of (session ID or None if no session is active, drug list),
+            or None if the drugs could not be fetched
+        """
+        try:
+            print("📋 Fetching current prescription from Android...")
+            response = requests.get(f"{self.base_url}/prescription/current", timeout=10)
+            
+            if response.status_code == 200:
+                data = response.json()
+                session_id = data.get('sessionId')
+                drugs = data.get('drugs', [])
+                
+                print(f"💊 Session {session_id}: retrieved {len(drugs)} drugs:")
+                for i, drug in enumerate(drugs, 1):
+                    print(f"   {i}. {drug}")
+                
+                return (str(session_id) if session_id else None), drugs
+            elif response.status_code == 404:
+                print("⚠️  No active prescription session")
+                drugs = self.get_prescription_drugs()
+                return (None, drugs) if drugs is not None else None
+            else:
+                print(f"❌ Failed to get prescription: {response.status_code}")
+                return None
+                
+        except Exception as e:
+            print(f"❌ Error fetching prescription: {e}")
+            return None
+    
+    def validate_drugs(self, drugs: List[str], session_id: Optional[str] = None,
+                       override: bool = False) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        Normalize and filter a drug list before GUI entry
+        
+        Args:
+            drugs: Drug names as received from Android
+            session_id: Android session ID; drugs already entered for this
+                        session are skipped
+            override: Keep over-long names and drugs already entered for
+                      this session (operator chose to enter them anyway)
+            
+        Returns:
+            Tuple of (accepted drug names, list of (rejected item, reason)).
+            If the list exceeds max_drugs_per_session, every drug is rejected.
+        """
+        accepted = []
+        rejected = []
+        seen = set()
+        already_entered = self.entered_sessions.get(session_id, set()) if session_id else set()
+        
+        for drug in drugs:
+            if not isinstance(drug, str):
+                rejected.append((repr(drug), REJECT_NOT_TEXT))
+                continue
+            
+            # Collapse internal whitespace; compare case-insensitively
+            name = " ".join(drug.split())
+            key = name.casefold()
+            
+            if not name:
+                rejected.append((repr(drug), REJECT_EMPTY))
+            elif key in seen:
+                rejected.append((name, REJECT_DUPLICATE))
+            elif len(name) > self.max_drug_name_length and not override:
+                rejected.append((name, REJECT_TOO_LONG))
+            elif key in already_entered and not override:
+                rejected.append((name, REJECT_ALREADY_ENTERED))
+            else:
+                seen.add(key)
+                accepted.append(name)
+        
+        # Never submit a truncated prescription: reject the whole list
+        if len(accepted) > self.max_drugs_per_session:
+            rejected.extend((name, REJECT_OVER_LIMIT) for name in accepted)
+            accepted = []
+        
+        return accepted, rejected
+    
+    def _remember_session(self, session_id: Optional[str], drugs: List[str]):
+        """Record drugs entered for a session in the bounded session index"""
+        if not session_id or self.recent_sessions_tracked <= 0:
+            return
+        
+        keys = self.entered_sessions.pop(session_id, set())
+        keys.update(drug.casefold() for drug in drugs)
+        self.entered_sessions[session_id] = keys
+        
+        # Evict the oldest sessions once the bound is exceeded
+        while len(self.entered_sessions) > self.recent_sessions_tracked:
+            del self.entered_sessions[next(iter(self.entered_sessions))]
+    
+    def paste_drugs_to_application(self, drugs: List[str], session_id: Optional[str] = None) -> bool:
         """
         Paste drugs into prescription application
         
         Args:
             drugs: List of drug names to paste
+            session_id: Android session ID the drugs belong to (optional)
             
         Returns:
-            True if successful, False otherwise
+            True if successful (including when every drug was already
+            entered for this session), False otherwise
         """
+        received = drugs or []
+        drugs, rejected = self.validate_drugs(received, session_id)
+        reasons = {reason for _, reason in rejected}
+        
+        if rejected:
+            print(f"⚠️  {len(rejected)} drug entries skipped:")
+            for item, reason in rejected:
+                print(f"   ✗ {item} ({reason})")
+        
+        if REJECT_OVER_LIMIT in reasons:
+            print(f"🛑 More than {self.max_drugs_per_session} drugs - nothing will be entered")
+            return False
+        
+        # Ask before dropping real content, or on every rejection if configured
+        overridable = reasons & {REJECT_TOO_LONG, REJECT_ALREADY_ENTERED}
+        if REJECT_TOO_LONG in reasons or (rejected and self.confirmation_required):
+            if overridable:
+                prompt = "Continue without skipped drugs (y), enter them anyway (a), or cancel (N)? "
+            else:
+                prompt = "Continue without skipped entries? (y/N): "
+            answer = input(prompt).strip().lower()
+            
+            if answer == 'a' and overridable:
+                drugs, _ = self.validate_drugs(received, session_id, override=True)
+                if not drugs:
+                    print(f"🛑 More than {self.max_drugs_per_session} drugs - nothing will be entered")
+                    return False
+            elif answer != 'y':
+                print("🛑 Drug entry cancelled by user")
+                return False
+        
         if not drugs:
+            if REJECT_ALREADY_ENTERED in reasons and REJECT_TOO_LONG not in reasons:
+                print("✅ All drugs were already entered for this session - nothing to type")
+                return True
             print("⚠️  No drugs to paste")
             return False
         
@@ -133,6 +283,9 @@ class WindowsAutomationClient:
                 # Press Enter to move to next field
                 pyautogui.press('enter')
                 
+                # Record immediately so an interrupted run is not re-typed
+                self._remember_session(session_id, [drug])
+                
                 # Delay before next drug
                 time.sleep(self.paste_delay)
             
@@ -190,7 +343,7 @@ class WindowsAutomationClient:
             print(f"❌ Error opening browser: {e}")
             return False
     
-    def complete_prescription_session(self) -> bool:
+    def complete_prescription_session(self, session_id: Optional[str] = None) -> bool:
         """Mark prescription session as complete on Android"""
         try:
             print("📱 Completing prescription session on Android...")
@@ -199,6 +352,8 @@ class WindowsAutomationClient:
             if response.status_code == 200:
                 data = response.json()
                 print(f"✅ Prescription session completed")
+                if session_id:
+                    self.entered_sessions.pop(session_id, None)
                 print(f"📊 {data.get('message', 'Session completed')}")
                 return True
             else:
@@ -227,14 +382,16 @@ class WindowsAutomationClient:
             print("❌ Workflow failed: Cannot connect to Android")
             return False
         
-        # Step 2: Get prescription drugs
-        drugs = self.get_prescription_drugs()
-        if not drugs:
+        # Step 2: Get prescription drugs with the session they belong to
+        prescription = self.get_prescription()
+        if not prescription or not prescription[1]:
             print("❌ Workflow failed: No drugs to process")
             return False
         
+        session_id, drugs = prescription
+        
         # Step 3: Paste drugs into application
-        if not self.paste_drugs_to_application(drugs):
+        if not self.paste_drugs_to_application(drugs, session_id):
             print("❌ Workflow failed: Could not enter drugs")
             return False
         
@@ -248,7 +405,7 @@ class WindowsAutomationClient:
             print("⚠️  Warning: Could not open browser, but continuing...")
         
         # Step 6: Complete session on Android
-        self.complete_prescription_session()
+        self.complete_prescription_session(session_id)
         
         print("=" * 60)
         print("🎉 Prescription automation workflow completed successfully!")
@@ -297,9 +454,10 @@ def main():
         elif choice == '3':
             client.run_complete_workflow(esign_url)
         elif choice == '4':
-            drugs = client.get_prescription_drugs()
-            if drugs:
-                client.paste_drugs_to_application(drugs)
+            prescription = client.get_prescription()
+            if prescription and prescription[1]:
+                session_id, drugs = prescription
+                client.paste_drugs_to_application(drugs, session_id)
         elif choice == '5':
             client.send_prescription_to_health_department()
         elif choice == '6':